@@ -5,16 +5,36 @@ Este script automatiza a configuração inicial de um ambiente Python focado em
 performance, segurança e integridade.
 """
 
+from __future__ import annotations
+
 __version__ = "1.0.0"
 
-import argparse
-import platform
-import shutil
+# Imports pesados e de uso pontual (argparse, platform, shutil) são adiados
+# para dentro das funções que os usam, afinando o caminho de startup.
+import concurrent.futures
+import functools
+import hashlib
+import os
+import re
 import socket
 import subprocess
 import sys
+
+try:
+    import tomllib
+except ImportError:  # Python 3.10: a stdlib ainda não traz tomllib
+    tomllib = None  # type: ignore[assignment]
+
 from pathlib import Path
-from typing import List, NoReturn
+from typing import TYPE_CHECKING, Any, Dict, Final, List, NoReturn, Optional
+
+if TYPE_CHECKING:
+    # Somente para as anotações (argparse.Namespace); em runtime o import é
+    # adiado para _setup_cli.
+    import argparse
+
+    # Dependência opcional: só existe quando o Poetry é importável in-process.
+    from poetry.console.application import Application  # type: ignore[import-not-found]
 
 # Constantes de configuração
 PYPROJECT_TOML_PATH = Path("pyproject.toml")
@@ -23,146 +43,9 @@ GITHUB_DIR = Path(".github")
 DEPENDABOT_CONFIG_PATH = GITHUB_DIR / "dependabot.yml"
 SECURITY_MD_PATH = Path("SECURITY.md")
 
-
-# --- Funções de Utilidade ---
-
-def _log(message: str, args: argparse.Namespace, is_verbose: bool = False) -> None:
-    """Função de log centralizada que respeita os modos dry-run e verbose."""
-    if is_verbose and not args.verbose:
-        return
-
-    prefix = "[DRY-RUN] " if args.dry_run else ""
-    print(f"{prefix}{message}")
-
-def _handle_error(message: str) -> NoReturn:
-    """Exibe uma mensagem de erro e encerra o script."""
-    print(f"❌ Erro: {message}", file=sys.stderr)
-    sys.exit(1)
-
-def _run_command(
-    command: List[str], args: argparse.Namespace, capture_output: bool = False
-) -> subprocess.CompletedProcess[str]:
-    """Executa um comando no shell, tratando erros e modo dry-run."""
-    _log(f"Executando comando: `{' '.join(command)}`", args, is_verbose=True)
-    if args.dry_run:
-        return subprocess.CompletedProcess(command, 0, "", "")
-
-    try:
-        result = subprocess.run(
-            command,
-            check=True,
-            text=True,
-            encoding='utf-8',
-            capture_output=capture_output,
-        )
-        return result
-    except FileNotFoundError:
-        # A verificação de Poetry é tratada separadamente, então este é um erro inesperado.
-        _handle_error(f"Comando '{command[0]}' não encontrado. Verifique se ele está instalado e no PATH.")
-    except subprocess.CalledProcessError as e:
-        error_message = f"O comando `{' '.join(command)}` falhou com o código de saída {e.returncode}."
-        if e.stderr and not capture_output:
-            error_message += f"\nErro:\n{e.stderr}"
-        _handle_error(error_message)
-
-def _is_windows() -> bool:
-    """Verifica se o sistema operacional é Windows."""
-    return platform.system() == "Windows"
-
-def _safe_write(path: Path, content: str, args: argparse.Namespace) -> None:
-    """Escreve conteúdo em um arquivo, com backup e modo dry-run."""
-    _log(f"Escrevendo no arquivo: {path}", args, is_verbose=True)
-    if args.dry_run:
-        return
-
-    if path.exists() and not args.force:
-        backup_path = path.with_suffix(f"{path.suffix}.bak")
-        try:
-            path.rename(backup_path)
-            _log(f"⚠️  Backup criado: {backup_path.name}", args)
-        except (OSError, PermissionError) as e:
-            _handle_error(f"Não foi possível criar o backup do arquivo {path.name}: {e}")
-
-    try:
-        path.write_text(content, encoding="utf-8")
-    except (OSError, PermissionError) as e:
-        _handle_error(f"Não foi possível escrever no arquivo {path.name}: {e}")
-
-# --- Funções de Geração de Configuração ---
-
-def _generate_pyproject_config(args: argparse.Namespace) -> None:
-    """Gera e escreve as configurações do Ruff e Mypy no pyproject.toml."""
-    _log("📝 Gerando configurações para Ruff, Mypy e Pytest no pyproject.toml...", args)
-
-    try:
-        pyproject_content = PYPROJECT_TOML_PATH.read_text(encoding="utf-8")
-    except FileNotFoundError:
-        # Se o pyproject.toml não existe, significa que o `poetry init` ainda não rodou.
-        pyproject_content = ""
-
-    config_to_add = ""
-
-    if "[tool.ruff]" not in pyproject_content:
-        python_version = f"py{sys.version_info.major}{sys.version_info.minor}"
-        config_to_add += f"""
-# --- Configurações de Qualidade de Código ---
-[tool.ruff]
-line-length = 88
-target-version = "{python_version}"
-
-[tool.ruff.lint]
-select = [
-    "F", "E", "W", "I", "N", "D", "Q", "S", "B", "A", "C4", "T20", "SIM", "PTH",
-    "TID", "ARG", "PIE", "PLC", "PLE", "PLR", "PLW", "RUF"
-]
-ignore = ["D203", "D212", "D213", "D416", "D417", "B905"]
-
-[tool.ruff.lint.mccabe]
-max-complexity = 10
-
-[tool.ruff.format]
-quote-style = "double"
-indent-style = "space"
-"""
-
-    if "[tool.mypy]" not in pyproject_content:
-        python_version = f"{sys.version_info.major}.{sys.version_info.minor}"
-        config_to_add += f"""
-[tool.mypy]
-python_version = "{python_version}"
-warn_return_any = true
-warn_unused_configs = true
-disallow_untyped_defs = true
-disallow_any_unimported = false
-no_implicit_optional = true
-check_untyped_defs = true
-strict_optional = true
-strict_equality = true
-ignore_missing_imports = true
-"""
-
-    if "[tool.pytest.ini_options]" not in pyproject_content:
-        config_to_add += """
-[tool.pytest.ini_options]
-testpaths = ["tests"]
-addopts = "-v --cov=src --cov-report=html --cov-report=term-missing --cov-fail-under=80"
-"""
-
-    if not args.dry_run and config_to_add:
-        try:
-            with PYPROJECT_TOML_PATH.open("a", encoding="utf-8") as f:
-                f.write(config_to_add)
-        except (OSError, PermissionError) as e:
-            _handle_error(f"Não foi possível escrever no arquivo pyproject.toml: {e}")
-    elif args.dry_run and config_to_add:
-        _log("Adicionaria configurações de ferramentas ao pyproject.toml", args, is_verbose=True)
-    elif not config_to_add:
-        _log("✅ Configurações de Ruff, Mypy e Pytest já existem no pyproject.toml.", args)
-
-def _generate_pre_commit_config(args: argparse.Namespace) -> None:
-    """Gera e escreve o arquivo de configuração do .pre-commit-config.yaml."""
-    _log("📝 Gerando arquivo de configuração .pre-commit-config.yaml...", args)
-    config_content = """repos:
+# Conteúdos estáticos dos arquivos gerados, codificados uma única vez no
+# import: cada escrita reaproveita os mesmos bytes, sem realocação nem encode.
+_PRE_COMMIT_CONFIG: Final[bytes] = """repos:
   - repo: https://github.com/pre-commit/pre-commit-hooks
     rev: v5.0.0
     hooks:
@@ -201,18 +84,9 @@ def _generate_pre_commit_config(args: argparse.Namespace) -> None:
     hooks:
       - id: detect-secrets
         args: ['--baseline', '.secrets.baseline']
-"""
-    _safe_write(PRE_COMMIT_CONFIG_PATH, config_content, args)
+""".encode("utf-8")
 
-def _generate_dependabot_config(args: argparse.Namespace) -> None:
-    """Gera o arquivo de configuração do Dependabot."""
-    _log("📝 Gerando arquivo de configuração .github/dependabot.yml...", args)
-    if not args.dry_run:
-        try:
-            GITHUB_DIR.mkdir(exist_ok=True)
-        except (FileExistsError, PermissionError) as e:
-            _handle_error(f"Não foi possível criar o diretório .github: {e}")
-    config_content = """version: 2
+_DEPENDABOT_CONFIG: Final[bytes] = """version: 2
 updates:
   - package-ecosystem: "pip"
     directory: "/"
@@ -233,13 +107,86 @@ updates:
     directory: "/"
     schedule:
       interval: "daily"
+""".encode("utf-8")
+
+# Esqueleto mínimo equivalente ao que `poetry init -n` geraria; escrito
+# diretamente para poupar um cold-start completo do Poetry.
+_PYPROJECT_SKELETON: Final[str] = f"""[tool.poetry]
+name = "{{project_name}}"
+version = "0.1.0"
+description = ""
+authors = []
+readme = "README.md"
+
+[tool.poetry.dependencies]
+python = "^{sys.version_info.major}.{sys.version_info.minor}"
+
+[build-system]
+requires = ["poetry-core"]
+build-backend = "poetry.core.masonry.api"
 """
-    _safe_write(DEPENDABOT_CONFIG_PATH, config_content, args)
 
-def _generate_security_policy(args: argparse.Namespace) -> None:
-    """Gera o arquivo SECURITY.md com uma política de segurança moderna."""
-    _log("📝 Gerando política de segurança em SECURITY.md...", args)
-    content = """# Security Policy
+# Seções adicionadas ao pyproject.toml, pré-computadas no import (a versão do
+# Python é fixa para o interpretador em execução); os geradores apenas filtram
+# as ausentes e fazem um único join.
+_RUFF_SECTION: Final[str] = f"""
+# --- Configurações de Qualidade de Código ---
+[tool.ruff]
+line-length = 88
+target-version = "py{sys.version_info.major}{sys.version_info.minor}"
+
+[tool.ruff.lint]
+select = [
+    "F", "E", "W", "I", "N", "D", "Q", "S", "B", "A", "C4", "T20", "SIM", "PTH",
+    "TID", "ARG", "PIE", "PLC", "PLE", "PLR", "PLW", "RUF"
+]
+ignore = ["D203", "D212", "D213", "D416", "D417", "B905"]
+
+[tool.ruff.lint.mccabe]
+max-complexity = 10
+
+[tool.ruff.format]
+quote-style = "double"
+indent-style = "space"
+"""
+
+_MYPY_SECTION: Final[str] = f"""
+[tool.mypy]
+python_version = "{sys.version_info.major}.{sys.version_info.minor}"
+warn_return_any = true
+warn_unused_configs = true
+disallow_untyped_defs = true
+disallow_any_unimported = false
+no_implicit_optional = true
+check_untyped_defs = true
+strict_optional = true
+strict_equality = true
+ignore_missing_imports = true
+"""
+
+_PYTEST_SECTION: Final[str] = """
+[tool.pytest.ini_options]
+testpaths = ["tests"]
+addopts = "-v --cov=src --cov-report=html --cov-report=term-missing --cov-fail-under=80"
+"""
+
+# Dependências de produção opcionais, uma linha TOML por pacote: o gerador
+# declara apenas os pacotes ainda ausentes na tabela de dependências.
+_RUNTIME_DEPS: Final[Dict[str, str]] = {
+    "pydantic": 'pydantic = ">=2.0"\n',
+    "orjson": 'orjson = "*"\n',
+    "uvloop": 'uvloop = {version = "*", markers = "sys_platform != \'win32\'"}\n',
+}
+
+_DEV_DEPS_SECTION: Final[str] = "\n[tool.poetry.group.dev.dependencies]\n" + "".join(
+    f'{dep} = "*"\n'
+    for dep in (
+        "ruff", "mypy", "bandit", "safety", "pre-commit",
+        "pytest", "pytest-cov", "py-spy", "semgrep"
+    )
+)
+
+_SECURITY_POLICY: Final[bytes] = """# Security Policy
 
 ## Supported Versions
 Nós priorizamos correções de segurança na versão mais recente (Rolling Release).
@@ -251,57 +198,387 @@ Nós priorizamos correções de segurança na versão mais recente (Rolling Rele
 
 ## Reporting a Vulnerability
 Se encontrar uma falha, por favor reporte via aba [Security](../../security) ou email.
-"""
-    _safe_write(SECURITY_MD_PATH, content, args)
+""".encode("utf-8")
+
+# Executor compartilhado para os geradores de configuração (I/O puro em
+# caminhos disjuntos); criado uma vez no import em vez de por chamada.
+_CONFIG_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+
+# Caminho absoluto do Poetry, resolvido uma única vez em
+# _check_poetry_installation para evitar nova varredura do PATH a cada
+# subprocess.run.
+_POETRY_BIN: Optional[str] = None
+
+# Caminho do venv gerenciado pelo Poetry, consultado uma única vez para
+# permitir invocar ferramentas direto do venv sem o wrapper `poetry run`.
+_VENV_PATH: Optional[Path] = None
+
+# Marcadores de seção procurados no pyproject.toml quando o parse TOML não é
+# possível: uma única passada de regex cobre os três.
+_TOOL_SECTION_RE = re.compile(r"\[tool\.(ruff|mypy|pytest\.ini_options)\]")
+
+# Flags de CLI promovidas a globais do módulo logo após o parse em main():
+# as funções utilitárias fazem um LOAD_GLOBAL em vez de repassar o Namespace
+# e pagar um lookup de atributo a cada chamada.
+_DRY_RUN = False
+_VERBOSE = False
+_FORCE = False
+_INSTALL_RUNTIME_DEPS = False
+
+
+# --- Funções de Utilidade ---
+
+def _log(message: str, is_verbose: bool = False) -> None:
+    """Função de log centralizada que respeita os modos dry-run e verbose."""
+    if is_verbose and not _VERBOSE:
+        return
+
+    prefix = "[DRY-RUN] " if _DRY_RUN else ""
+    # Um único write já com o \n: print() emite payload e newline em duas
+    # escritas, que threads concorrentes intercalam no meio da linha.
+    sys.stdout.write(f"{prefix}{message}\n")
+
+def _apply_cli_flags(args: argparse.Namespace) -> None:
+    """Copia as flags parseadas para os globais lidos pelas demais funções."""
+    global _DRY_RUN, _VERBOSE, _FORCE, _INSTALL_RUNTIME_DEPS
+    _DRY_RUN = args.dry_run
+    _VERBOSE = args.verbose
+    _FORCE = args.force
+    _INSTALL_RUNTIME_DEPS = args.install_runtime_deps
+
+def _handle_error(message: str) -> NoReturn:
+    """Exibe uma mensagem de erro e encerra o script."""
+    print(f"❌ Erro: {message}", file=sys.stderr)
+    sys.exit(1)
+
+def _run_command(
+    command: List[str], capture_output: bool = False
+) -> subprocess.CompletedProcess[Any]:
+    """Executa um comando no shell, tratando erros e modo dry-run."""
+    if command[0] == "poetry" and _POETRY_BIN:
+        # Usa o caminho absoluto já resolvido, poupando a resolução de PATH
+        # que o subprocess refaria a cada chamada.
+        command = [_POETRY_BIN] + command[1:]
+    _log(f"Executando comando: `{' '.join(command)}`", is_verbose=True)
+    if _DRY_RUN:
+        return subprocess.CompletedProcess(command, 0, "", "")
+
+    try:
+        if capture_output:
+            return subprocess.run(
+                command,
+                check=True,
+                text=True,
+                encoding='utf-8',
+                capture_output=True,
+            )
+        # Sem captura não há pipes a decodificar: omitir text/encoding
+        # evita os wrappers de codec, e DEVNULL dispensa o par de
+        # syscalls pipe() para o stdin herdado.
+        return subprocess.run(
+            command,
+            check=True,
+            stdin=subprocess.DEVNULL,
+        )
+    except FileNotFoundError:
+        # A verificação de Poetry é tratada separadamente, então este é um erro inesperado.
+        _handle_error(f"Comando '{command[0]}' não encontrado. Verifique se ele está instalado e no PATH.")
+    except subprocess.CalledProcessError as e:
+        error_message = f"O comando `{' '.join(command)}` falhou com o código de saída {e.returncode}."
+        if capture_output and e.stderr:
+            error_message += f"\nErro:\n{e.stderr}"
+        _handle_error(error_message)
+
+@functools.lru_cache(maxsize=8)
+def _read_pyproject_cached(path: str, mtime_ns: int) -> str:
+    """Lê o conteúdo do pyproject.toml, memoizado por caminho e mtime."""
+    # read_bytes + decode: uma única alocação, sem montar TextIOWrapper.
+    return Path(path).read_bytes().decode("utf-8")
+
+def _read_pyproject() -> str:
+    """Retorna o conteúdo do pyproject.toml, ou string vazia se não existir.
+
+    A leitura é cacheada pelo mtime do arquivo, então chamadas repetidas na
+    mesma execução custam apenas um `stat`.
+    """
+    try:
+        stat_result = PYPROJECT_TOML_PATH.stat()
+    except FileNotFoundError:
+        # Se o pyproject.toml não existe, significa que o `poetry init` ainda não rodou.
+        return ""
+    return _read_pyproject_cached(str(PYPROJECT_TOML_PATH.resolve()), stat_result.st_mtime_ns)
+
+@functools.lru_cache(maxsize=1)
+def _poetry_application() -> Optional[Application]:
+    """Retorna uma Application do Poetry reutilizável, se importável in-process.
+
+    Quando o Poetry está instalado no mesmo interpretador (ex.: `pip install
+    poetry`), uma única Application carregada atende todos os subcomandos,
+    evitando um cold-start completo do interpretador por chamada. Instalações
+    via pipx não são importáveis e caem no fallback por subprocess.
+    """
+    try:
+        from poetry.console.application import Application  # type: ignore[import-not-found]
+    except ImportError:
+        return None
+    application = Application()
+    application.auto_exits(False)
+    return application
+
+def _run_poetry(command_args: List[str]) -> None:
+    """Executa um subcomando do Poetry, em processo quando possível."""
+    application = _poetry_application()
+    if application is None:
+        _run_command(["poetry"] + command_args)
+        return
+
+    _log(f"Executando comando (in-process): `poetry {' '.join(command_args)}`", is_verbose=True)
+    if _DRY_RUN:
+        return
+
+    from cleo.io.inputs.argv_input import ArgvInput  # type: ignore[import-not-found]
+
+    status = application.run(ArgvInput(["poetry"] + command_args))
+    if status != 0:
+        _handle_error(
+            f"O comando `poetry {' '.join(command_args)}` falhou com o código de saída {status}."
+        )
+
+@functools.cache
+def _is_windows() -> bool:
+    """Verifica se o sistema operacional é Windows (resultado memoizado)."""
+    # sys.platform é uma constante definida no build do interpretador, bem
+    # mais barata que o uname() de platform.system().
+    return sys.platform == "win32"
+
+def _content_version_header(path: Path, content: bytes) -> bytes:
+    """Monta a linha-sentinela com o hash do conteúdo, no estilo de comentário do arquivo."""
+    digest = hashlib.md5(content, usedforsecurity=False).hexdigest()[:12]
+    if path.suffix == ".md":
+        return f"<!-- content-version: {digest} -->\n".encode("ascii")
+    return f"# content-version: {digest}\n".encode("ascii")
+
+def _safe_write(path: Path, content: bytes) -> None:
+    """Escreve conteúdo em um arquivo, com backup e modo dry-run."""
+    _log(f"Escrevendo no arquivo: {path}", is_verbose=True)
+    if _DRY_RUN:
+        return
+
+    header = _content_version_header(path, content)
+    if path.exists() and not _FORCE:
+        # Se a sentinela da primeira linha já corresponde ao conteúdo atual,
+        # a regeneração vira um no-op: sem backup, rename ou reescrita.
+        try:
+            with path.open("rb") as f:
+                first_line = f.readline()
+        except OSError:
+            first_line = b""
+        if first_line == header:
+            _log(f"✅ {path.name} já está atualizado; regeneração pulada.", is_verbose=True)
+            return
+        needs_backup = True
+    else:
+        needs_backup = False
+
+    # Escreve primeiro em um arquivo temporário e promove com os.replace
+    # (rename atômico em POSIX e Win32): o conteúdo antigo nunca é perdido
+    # se o script morrer no meio da escrita.
+    tmp_path = path.with_suffix(f"{path.suffix}.tmp")
+    try:
+        # Escrita binária de uma vez só: evita o TextIOWrapper e seu buffer
+        # intermediário para conteúdos pequenos escritos de um único fôlego.
+        tmp_path.write_bytes(header + content)
+    except (OSError, PermissionError) as e:
+        _handle_error(f"Não foi possível escrever no arquivo {path.name}: {e}")
+
+    if needs_backup:
+        backup_path = path.with_suffix(f"{path.suffix}.bak")
+        try:
+            path.rename(backup_path)
+            _log(f"⚠️  Backup criado: {backup_path.name}")
+        except (OSError, PermissionError) as e:
+            _handle_error(f"Não foi possível criar o backup do arquivo {path.name}: {e}")
+
+    try:
+        os.replace(tmp_path, path)
+    except (OSError, PermissionError) as e:
+        _handle_error(f"Não foi possível escrever no arquivo {path.name}: {e}")
+
+# --- Funções de Geração de Configuração ---
+
+def _generate_pyproject_config() -> None:
+    """Gera e escreve as configurações do Ruff e Mypy no pyproject.toml."""
+    _log("📝 Gerando configurações para Ruff, Mypy e Pytest no pyproject.toml...")
+
+    pyproject_content = _read_pyproject()
+
+    # Um único parse TOML substitui as varreduras de substring por seção:
+    # cada checagem de presença vira um lookup O(1) em dict.
+    if tomllib is not None:
+        try:
+            tool_sections = tomllib.loads(pyproject_content).get("tool", {})
+        except tomllib.TOMLDecodeError:
+            # Arquivo malformado: mantém a varredura textual como fallback.
+            tool_sections = None
+    else:
+        # Python 3.10 sem tomllib: cai direto na varredura textual.
+        tool_sections = None
+
+    if tool_sections is not None:
+        has_ruff = "ruff" in tool_sections
+        has_mypy = "mypy" in tool_sections
+        has_pytest = "pytest" in tool_sections
+    else:
+        found_sections = set(_TOOL_SECTION_RE.findall(pyproject_content))
+        has_ruff = "ruff" in found_sections
+        has_mypy = "mypy" in found_sections
+        has_pytest = "pytest.ini_options" in found_sections
+
+    # Coleta as seções ausentes e concatena tudo com um único join no final:
+    # uma alocação e uma escrita, em vez de `+=` por seção.
+    sections: List[str] = []
+
+    if not has_ruff:
+        sections.append(_RUFF_SECTION)
+
+    if not has_mypy:
+        sections.append(_MYPY_SECTION)
+
+    if not has_pytest:
+        sections.append(_PYTEST_SECTION)
+
+    # Declara as dependências diretamente nas tabelas do pyproject.toml, em vez
+    # de uma chamada `poetry add` por grupo: o solver roda uma única vez no
+    # `poetry lock` feito em _install_dependencies.
+    content_modified = False
+    if _INSTALL_RUNTIME_DEPS:
+        # Checagem por pacote na tabela parseada: um substring sobre o texto
+        # inteiro confundiria `pydantic-settings` (ou um comentário) com a
+        # dependência já declarada e pularia os três pacotes de uma vez.
+        if tool_sections is not None:
+            declared_deps = tool_sections.get("poetry", {}).get("dependencies", {})
+        else:
+            declared_deps = {
+                name for name in _RUNTIME_DEPS
+                if re.search(rf"^{name}\s*=", pyproject_content, re.MULTILINE)
+            }
+        missing_lines = "".join(
+            line for name, line in _RUNTIME_DEPS.items() if name not in declared_deps
+        )
+        dependencies_header = "[tool.poetry.dependencies]"
+        if not missing_lines:
+            pass
+        elif dependencies_header in pyproject_content:
+            # `poetry init -n` já criou a tabela (com a restrição de python);
+            # insere os pacotes logo após o cabeçalho para não duplicar a tabela.
+            pyproject_content = pyproject_content.replace(
+                dependencies_header,
+                f"{dependencies_header}\n{missing_lines}".rstrip("\n"),
+                1,
+            )
+            content_modified = True
+        else:
+            sections.append(
+                f"\n{dependencies_header}\n"
+                f'python = "^{sys.version_info.major}.{sys.version_info.minor}"\n'
+                f"{missing_lines}"
+            )
+
+    if "[tool.poetry.group.dev.dependencies]" not in pyproject_content:
+        sections.append(_DEV_DEPS_SECTION)
+
+    config_to_add = "".join(sections)
+
+    if not _DRY_RUN and (config_to_add or content_modified):
+        try:
+            if content_modified:
+                PYPROJECT_TOML_PATH.write_bytes(
+                    (pyproject_content + config_to_add).encode("utf-8")
+                )
+            else:
+                # Append binário sem buffer: um único write() em vez de
+                # flushes em blocos de 8KB do TextIOWrapper.
+                with PYPROJECT_TOML_PATH.open("ab", buffering=0) as f:
+                    f.write(config_to_add.encode("utf-8"))
+        except (OSError, PermissionError) as e:
+            _handle_error(f"Não foi possível escrever no arquivo pyproject.toml: {e}")
+    elif _DRY_RUN and (config_to_add or content_modified):
+        _log("Adicionaria configurações de ferramentas ao pyproject.toml", is_verbose=True)
+    else:
+        _log("✅ Configurações de Ruff, Mypy e Pytest já existem no pyproject.toml.")
+
+def _generate_pre_commit_config() -> None:
+    """Gera e escreve o arquivo de configuração do .pre-commit-config.yaml."""
+    _log("📝 Gerando arquivo de configuração .pre-commit-config.yaml...")
+    _safe_write(PRE_COMMIT_CONFIG_PATH, _PRE_COMMIT_CONFIG)
+
+def _generate_dependabot_config() -> None:
+    """Gera o arquivo de configuração do Dependabot."""
+    _log("📝 Gerando arquivo de configuração .github/dependabot.yml...")
+    if not _DRY_RUN:
+        try:
+            # Fast-path com um único stat(): no caso comum (diretório já
+            # existe) evita o mkdir + FileExistsError engolido do pathlib.
+            if not os.path.isdir(GITHUB_DIR):
+                os.makedirs(GITHUB_DIR, exist_ok=True)
+        except (FileExistsError, PermissionError) as e:
+            _handle_error(f"Não foi possível criar o diretório .github: {e}")
+    _safe_write(DEPENDABOT_CONFIG_PATH, _DEPENDABOT_CONFIG)
+
+def _generate_security_policy() -> None:
+    """Gera o arquivo SECURITY.md com uma política de segurança moderna."""
+    _log("📝 Gerando política de segurança em SECURITY.md...")
+    _safe_write(SECURITY_MD_PATH, _SECURITY_POLICY)
 
 # --- Funções de Orquestração ---
 
-def _check_git_initialized(args: argparse.Namespace) -> None:
+def _check_git_initialized() -> None:
     """Verifica se o Git está inicializado e inicializa se necessário."""
-    _log("🔎 Verificando se o Git está inicializado...", args)
+    _log("🔎 Verificando se o Git está inicializado...")
     git_dir = Path(".git")
 
     if git_dir.exists():
-        _log("✅ Repositório Git já inicializado.", args)
+        _log("✅ Repositório Git já inicializado.")
         return
 
+    import shutil
+
     if not shutil.which("git"):
-        _log("⚠️  Git não encontrado no PATH. Pulando inicialização do Git.", args)
+        _log("⚠️  Git não encontrado no PATH. Pulando inicialização do Git.")
         return
 
-    _log("🛠️  Inicializando repositório Git...", args)
-    _run_command(["git", "init"], args)
-    _log("✅ Repositório Git inicializado com sucesso.", args)
+    _log("🛠️  Inicializando repositório Git...")
+    _run_command(["git", "init"])
+    _log("✅ Repositório Git inicializado com sucesso.")
 
-def _check_connectivity(args: argparse.Namespace) -> None:
+def _check_connectivity() -> None:
     """Verifica conectividade com a internet antes de instalar dependências."""
-    _log("🔎 Verificando conectividade com a internet...", args, is_verbose=True)
+    _log("🔎 Verificando conectividade com a internet...", is_verbose=True)
 
     try:
         # Tenta conectar ao PyPI para verificar conectividade
         socket.create_connection(("pypi.org", 443), timeout=5)
-        _log("✅ Conectividade confirmada.", args, is_verbose=True)
+        _log("✅ Conectividade confirmada.", is_verbose=True)
     except (socket.timeout, socket.error, OSError):
         _handle_error(
             "Não foi possível conectar à internet. "
             "Verifique sua conexão e proxies antes de continuar."
         )
 
-def _create_project_structure(args: argparse.Namespace) -> None:
+def _create_project_structure() -> None:
     """Cria a estrutura básica de pastas do projeto."""
-    _log("📁 Criando estrutura de pastas do projeto...", args)
+    _log("📁 Criando estrutura de pastas do projeto...")
 
     # Detecta o nome do projeto do pyproject.toml
     project_name = "my_project"
-    if PYPROJECT_TOML_PATH.exists():
-        try:
-            content = PYPROJECT_TOML_PATH.read_text(encoding="utf-8")
-            for line in content.split("\n"):
-                if line.startswith("name = "):
-                    project_name = line.split("=")[1].strip().strip('"').strip("'")
-                    break
-        except (OSError, IndexError):
-            pass
+    try:
+        content = _read_pyproject()
+        for line in content.split("\n"):
+            if line.startswith("name = "):
+                project_name = line.split("=")[1].strip().strip('"').strip("'")
+                break
+    except (OSError, IndexError):
+        pass
 
     # Cria estrutura de diretórios
     directories = [
@@ -311,14 +588,14 @@ def _create_project_structure(args: argparse.Namespace) -> None:
     ]
 
     for directory in directories:
-        if not args.dry_run:
+        if not _DRY_RUN:
             try:
                 directory.mkdir(parents=True, exist_ok=True)
-                _log(f"✅ Criado: {directory}", args, is_verbose=True)
+                _log(f"✅ Criado: {directory}", is_verbose=True)
             except (OSError, PermissionError) as e:
-                _log(f"⚠️  Não foi possível criar {directory}: {e}", args)
+                _log(f"⚠️  Não foi possível criar {directory}: {e}")
         else:
-            _log(f"Criaria diretório: {directory}", args, is_verbose=True)
+            _log(f"Criaria diretório: {directory}", is_verbose=True)
 
     # Cria arquivos __init__.py
     init_files = [
@@ -327,19 +604,19 @@ def _create_project_structure(args: argparse.Namespace) -> None:
     ]
 
     for init_file in init_files:
-        if not init_file.exists() and not args.dry_run:
+        if not init_file.exists() and not _DRY_RUN:
             try:
                 content = f'"""Package initialization for {init_file.parent.name}."""\n'
                 if init_file.parent.name == project_name:
                     content += '\n__version__ = "0.1.0"\n'
-                init_file.write_text(content, encoding="utf-8")
-                _log(f"✅ Criado: {init_file}", args, is_verbose=True)
+                init_file.write_bytes(content.encode("utf-8"))
+                _log(f"✅ Criado: {init_file}", is_verbose=True)
             except (OSError, PermissionError) as e:
-                _log(f"⚠️  Não foi possível criar {init_file}: {e}", args)
+                _log(f"⚠️  Não foi possível criar {init_file}: {e}")
 
     # Cria arquivo main.py de exemplo
     main_file = Path("src") / project_name / "main.py"
-    if not main_file.exists() and not args.dry_run:
+    if not main_file.exists() and not _DRY_RUN:
         example_content = f'''"""Main module for {project_name}."""
 
 def greet(name: str) -> str:
@@ -365,14 +642,14 @@ if __name__ == "__main__":
     main()
 '''
         try:
-            main_file.write_text(example_content, encoding="utf-8")
-            _log(f"✅ Criado: {main_file}", args)
+            main_file.write_bytes(example_content.encode("utf-8"))
+            _log(f"✅ Criado: {main_file}")
         except (OSError, PermissionError) as e:
-            _log(f"⚠️  Não foi possível criar {main_file}: {e}", args)
+            _log(f"⚠️  Não foi possível criar {main_file}: {e}")
 
     # Cria arquivo de teste de exemplo
     test_file = Path("tests") / "test_example.py"
-    if not test_file.exists() and not args.dry_run:
+    if not test_file.exists() and not _DRY_RUN:
         test_content = f'''"""Example test module for {project_name}."""
 
 from src.{project_name}.main import greet
@@ -391,14 +668,14 @@ def test_greet_empty() -> None:
     assert result == "Hello, !"
 '''
         try:
-            test_file.write_text(test_content, encoding="utf-8")
-            _log(f"✅ Criado: {test_file}", args)
+            test_file.write_bytes(test_content.encode("utf-8"))
+            _log(f"✅ Criado: {test_file}")
         except (OSError, PermissionError) as e:
-            _log(f"⚠️  Não foi possível criar {test_file}: {e}", args)
+            _log(f"⚠️  Não foi possível criar {test_file}: {e}")
 
-def _validate_setup(args: argparse.Namespace) -> None:
+def _validate_setup() -> None:
     """Valida se o setup foi concluído com sucesso."""
-    _log("\n🔍 Validando configuração...", args)
+    _log("\n🔍 Validando configuração...")
 
     issues = []
 
@@ -415,28 +692,32 @@ def _validate_setup(args: argparse.Namespace) -> None:
             issues.append(f"Arquivo não encontrado: {file}")
 
     # Verifica se pre-commit está instalado
-    if shutil.which("poetry"):
+    if _POETRY_BIN:
         result = _run_command(
-            ["poetry", "run", "pre-commit", "--version"],
-            args,
+            _pre_commit_command() + ["--version"],
             capture_output=True
         )
         if result.returncode != 0:
             issues.append("Pre-commit não está instalado corretamente")
 
     if issues:
-        _log("⚠️  Problemas encontrados durante a validação:", args)
+        _log("⚠️  Problemas encontrados durante a validação:")
         for issue in issues:
-            _log(f"  - {issue}", args)
+            _log(f"  - {issue}")
     else:
-        _log("✅ Validação concluída com sucesso!", args)
+        _log("✅ Validação concluída com sucesso!")
 
 
-def _check_poetry_installation(args: argparse.Namespace) -> None:
+def _check_poetry_installation() -> None:
     """Verifica se o Poetry está instalado de forma inteligente."""
-    _log("🔎 Verificando se o Poetry está instalado...", args)
-    if shutil.which("poetry"):
-        _log("✅ Poetry encontrado.", args)
+    global _POETRY_BIN
+    _log("🔎 Verificando se o Poetry está instalado...")
+    import shutil
+
+    poetry_bin = shutil.which("poetry")
+    if poetry_bin:
+        _POETRY_BIN = poetry_bin
+        _log("✅ Poetry encontrado.")
         return
 
     # Se Poetry não foi encontrado, cria uma mensagem de erro mais útil
@@ -447,41 +728,84 @@ def _check_poetry_installation(args: argparse.Namespace) -> None:
 
     _handle_error(f"Poetry não encontrado. {suggestion}")
 
-def _initialize_poetry_project(args: argparse.Namespace) -> None:
-    """Inicializa um novo projeto Poetry."""
+def _initialize_poetry_project() -> None:
+    """Inicializa um novo projeto Poetry escrevendo o pyproject.toml mínimo.
+
+    Gerar o esqueleto diretamente evita o subprocess `poetry init -n`, que
+    paga um startup completo do Poetry só para emitir texto estático.
+    """
     if PYPROJECT_TOML_PATH.exists():
-        _log("✅ Projeto Poetry já inicializado.", args)
+        _log("✅ Projeto Poetry já inicializado.")
+        return
+    _log("🛠️  Inicializando projeto Poetry...")
+    if _DRY_RUN:
         return
-    _log("🛠️  Inicializando projeto Poetry...", args)
-    _run_command(["poetry", "init", "-n"], args)
-
-def _add_dependencies(args: argparse.Namespace) -> None:
-    """Adiciona as dependências de produção e desenvolvimento ao projeto."""
-
-    # Dependências de produção são opcionais
-    if args.install_runtime_deps:
-        _log("📦 Adicionando dependências de produção opcionais...", args)
-        prod_deps = ["pydantic>=2.0", "orjson"]
-        if not _is_windows():
-            prod_deps.append("uvloop")
-        _run_command(["poetry", "add"] + prod_deps, args)
-    else:
-        _log("⏭️  Pulando dependências de produção (use --install-runtime-deps para incluí-las).", args)
 
-    _log("🔧 Adicionando dependências de desenvolvimento...", args)
-    dev_deps = [
-        "ruff", "mypy", "bandit", "safety", "pre-commit",
-        "pytest", "pytest-cov", "py-spy", "semgrep"
-    ]
-    _run_command(["poetry", "add", "--group", "dev"] + dev_deps, args)
+    # Mesma heurística do `poetry init`: o nome do projeto vem do diretório.
+    project_name = re.sub(r"[^a-z0-9_.-]+", "-", Path.cwd().name.lower()).strip("-.") or "my-project"
+    try:
+        PYPROJECT_TOML_PATH.write_bytes(
+            _PYPROJECT_SKELETON.format(project_name=project_name).encode("utf-8")
+        )
+    except (OSError, PermissionError) as e:
+        _handle_error(f"Não foi possível escrever no arquivo pyproject.toml: {e}")
+
+def _install_dependencies() -> None:
+    """Resolve e instala as dependências declaradas no pyproject.toml."""
+
+    # As tabelas de dependências já foram escritas por _generate_pyproject_config,
+    # então o solver do Poetry roda exatamente uma vez, em vez de uma chamada
+    # `poetry add` (startup + resolução completa) por grupo.
+    # `lock` e `install` sem flags extras: válidos tanto no Poetry 1.x quanto
+    # no 2.x (`--no-update` foi removido e `--sync` depreciado no 2.x; para um
+    # projeto recém-criado ambos eram redundantes de qualquer forma).
+    _log("🔒 Resolvendo dependências (poetry lock)...")
+    _run_poetry(["lock"])
+
+    _log("📥 Instalando dependências...")
+    _run_poetry(["install"])
+
+def _locate_venv() -> Optional[Path]:
+    """Descobre o caminho do venv do Poetry, consultando-o no máximo uma vez.
 
-def _setup_pre_commit_hooks(args: argparse.Namespace) -> None:
+    A sondagem é não fatal: se o venv ainda não existe (ou o comando falha),
+    retorna None e os chamadores usam o fallback via `poetry run`.
+    """
+    global _VENV_PATH
+    if _VENV_PATH is None and not _DRY_RUN:
+        result = subprocess.run(
+            [_POETRY_BIN or "poetry", "env", "info", "-p"],
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            check=False,
+        )
+        output = (result.stdout or "").strip()
+        if result.returncode == 0 and output:
+            _VENV_PATH = Path(output)
+    return _VENV_PATH
+
+def _pre_commit_command() -> List[str]:
+    """Monta o comando do pre-commit, invocando o binário do venv quando possível.
+
+    Chamar `{venv}/bin/pre-commit` diretamente evita um startup completo do
+    Poetry (via `poetry run`) só para localizar o executável.
+    """
+    venv_path = _locate_venv()
+    if venv_path:
+        bin_dir = "Scripts" if _is_windows() else "bin"
+        return [str(venv_path / bin_dir / "pre-commit")]
+    return ["poetry", "run", "pre-commit"]
+
+def _setup_pre_commit_hooks() -> None:
     """Instala e configura os hooks de pre-commit."""
-    _log("⚙️  Instalando hooks de pre-commit...", args)
-    _run_command(["poetry", "run", "pre-commit", "install"], args)
+    _log("⚙️  Instalando hooks de pre-commit...")
+    _run_command(_pre_commit_command() + ["install"])
 
 def _setup_cli() -> argparse.Namespace:
     """Configura a interface de linha de comando."""
+    import argparse
+
     parser = argparse.ArgumentParser(description="Automatiza a configuração de um ambiente Python de alta performance.")
     parser.add_argument(
         "--dry-run",
@@ -508,40 +832,49 @@ def _setup_cli() -> argparse.Namespace:
 def main() -> None:
     """Função principal para orquestrar a configuração do ambiente."""
     args = _setup_cli()
+    _apply_cli_flags(args)
 
-    _log(f"\n🚀 Python Stack Bootstrapper v{__version__}", args)
-    _log("Iniciando a configuração do ambiente Python de alta performance...\n", args)
+    _log(f"\n🚀 Python Stack Bootstrapper v{__version__}")
+    _log("Iniciando a configuração do ambiente Python de alta performance...\n")
 
     # Verificações iniciais
-    _check_poetry_installation(args)
-    _check_git_initialized(args)
-    _check_connectivity(args)
+    _check_poetry_installation()
+    _check_git_initialized()
+    _check_connectivity()
 
     # Inicialização do projeto
-    _initialize_poetry_project(args)
-    _create_project_structure(args)
-
-    # Instalação de dependências
-    _add_dependencies(args)
-
-    # Geração de arquivos de configuração
-    _generate_pyproject_config(args)
-    _generate_pre_commit_config(args)
-    _generate_dependabot_config(args)
-    _generate_security_policy(args)
+    _initialize_poetry_project()
+    _create_project_structure()
+
+    # Geração de arquivos de configuração e instalação de dependências.
+    # O pyproject.toml precisa estar completo antes do `poetry lock` (o solver
+    # lê as tabelas geradas), mas os outros três configs são independentes:
+    # suas escritas rodam em paralelo com o solver, ficando escondidas dentro
+    # do wall-clock da resolução de dependências.
+    _generate_pyproject_config()
+    background_tasks = (
+        _install_dependencies,
+        _generate_pre_commit_config,
+        _generate_dependabot_config,
+        _generate_security_policy,
+    )
+    futures = [_CONFIG_EXECUTOR.submit(task) for task in background_tasks]
+    concurrent.futures.wait(futures)
+    for future in futures:
+        future.result()
 
     # Setup de hooks
-    _setup_pre_commit_hooks(args)
+    _setup_pre_commit_hooks()
 
     # Validação final
-    _validate_setup(args)
+    _validate_setup()
 
     # Mensagens finais
-    _log("\n✅ Ambiente configurado com sucesso!", args)
-    _log("Execute `poetry shell` para ativar o ambiente virtual.", args)
-    _log("💡 Dica: execute `poetry config virtualenvs.in-project true` para criar o .venv dentro do projeto.", args)
-    _log("\n🔒 Lembre-se de commitar o arquivo `poetry.lock` para garantir builds reprodutíveis.", args)
-    _log("\n📚 Consulte o README.md para mais informações sobre o projeto.", args)
+    _log("\n✅ Ambiente configurado com sucesso!")
+    _log("Execute `poetry shell` para ativar o ambiente virtual.")
+    _log("💡 Dica: execute `poetry config virtualenvs.in-project true` para criar o .venv dentro do projeto.")
+    _log("\n🔒 Lembre-se de commitar o arquivo `poetry.lock` para garantir builds reprodutíveis.")
+    _log("\n📚 Consulte o README.md para mais informações sobre o projeto.")
 
 if __name__ == "__main__":
     main()